@@ -12,19 +12,41 @@ Usage:
     python3 scripts/download_apple_docs.py
 """
 
+import atexit
+import base64
+import gzip
+import io
 import json
 import os
 import re
+import shutil
+import sqlite3
 import sys
+import tempfile
+import threading
 import time
 import zipfile
-from io import BytesIO
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPException, HTTPResponse, HTTPSConnection
 from pathlib import Path
-from typing import Any, Optional
-from urllib.request import urlopen, Request
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 from urllib.error import URLError, HTTPError
+from urllib.parse import unquote, urljoin, urlsplit, urlunsplit
+from urllib.request import getproxies, proxy_bypass
 import html
 
+try:
+    import orjson
+except ImportError:  # Optional; JSON falls back to the json module
+    orjson = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # Optional; transcripts fall back to regex extraction
+    HTMLParser = None
+
 # Base URLs
 DOCS_JSON_BASE = "https://developer.apple.com/tutorials/data/documentation"
 SAMPLE_DOWNLOAD_BASE = "https://docs-assets.developer.apple.com/published"
@@ -38,6 +60,32 @@ JSON_DIR = DOCS_DIR / "json"
 MARKDOWN_DIR = DOCS_DIR / "markdown"
 SAMPLES_DIR = DOCS_DIR / "samples"
 WWDC_DIR = DOCS_DIR / "wwdc"
+HTTP_CACHE_PATH = DOCS_DIR / ".http_cache.sqlite3"
+
+# Maximum number of concurrent requests to Apple's servers
+DOWNLOAD_WORKERS = 8
+# Wider limit for the one-off sweep of every class's child docs
+CHILD_SWEEP_WORKERS = 16
+
+# Chunk size for streaming downloads and zip members to disk
+COPY_CHUNK_SIZE = 1 << 20
+# Buffer size for files generated through many small writes
+WRITE_BUFFER_SIZE = 1 << 20
+
+# HTTP client settings
+USER_AGENT = "screencapturekit-rs-docs/1.0"
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+MAX_REDIRECTS = 5
+
+# Patterns used while processing WWDC pages and transcripts
+TRANSCRIPT_START_TAG = '<section id="transcript-content">'
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+NOTES_CONTENT_RE = re.compile(r'\n## .+', re.DOTALL)
 
 # Documentation paths to download (relative to screencapturekit)
 DOC_PATHS = [
@@ -88,6 +136,9 @@ SAMPLE_PROJECTS = [
     },
 ]
 
+# File types extracted from sample projects (source code and related files)
+SAMPLE_FILE_EXTENSIONS = frozenset({".swift", ".h", ".m", ".mm", ".metal", ".md", ".txt", ".plist"})
+
 # WWDC Sessions to download
 WWDC_SESSIONS = [
     {
@@ -117,12 +168,228 @@ WWDC_SESSIONS = [
 ]
 
 
-def fetch_json(url: str) -> Optional[dict]:
-    """Fetch JSON from URL with error handling."""
+# Keep-alive connections, one per (thread, host), reused across requests
+_connections = threading.local()
+
+
+def _new_connection(scheme: str, host: str, timeout: float) -> tuple:
+    """Open a connection to a host, honouring the environment's proxy settings.
+    
+    HTTPS goes through a CONNECT tunnel. Returns ``(conn, proxy_headers)``,
+    where ``proxy_headers`` is None unless requests are forwarded by a plain
+    HTTP proxy, which needs absolute request targets and these extra headers.
+    """
+    conn_class = HTTPSConnection if scheme == "https" else HTTPConnection
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(host):
+        return conn_class(host, timeout=timeout), None
+    
+    proxy = urlsplit(proxy if "://" in proxy else f"//{proxy}")
+    proxy_headers = {}
+    if proxy.username is not None:
+        credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+        proxy_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode("ascii")
+    
+    conn = conn_class(proxy.netloc.rpartition("@")[2], timeout=timeout)
+    if scheme == "https":
+        conn.set_tunnel(host, headers=proxy_headers)
+        return conn, None
+    return conn, proxy_headers
+
+
+def _connection(scheme: str, host: str, timeout: float) -> tuple:
+    """Get this thread's pooled connection to a host, creating it on first use.
+    
+    Returns ``(conn, proxy_headers)`` as described in ``_new_connection``.
+    """
+    pool = getattr(_connections, "pool", None)
+    if pool is None:
+        pool = _connections.pool = {}
+    
+    entry = pool.get((scheme, host))
+    if entry is None:
+        entry = pool[(scheme, host)] = _new_connection(scheme, host, timeout)
+    else:
+        conn = entry[0]
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return entry
+
+
+# Worker pools shared by every batch of requests in a run, keyed by size. Their
+# threads outlive each batch, so the keep-alive connections above do too.
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _executor(max_workers: int = DOWNLOAD_WORKERS) -> ThreadPoolExecutor:
+    """Get the shared worker pool of the given size, creating it on first use."""
+    with _executors_lock:
+        executor = _executors.get(max_workers)
+        if executor is None:
+            executor = _executors[max_workers] = ThreadPoolExecutor(max_workers=max_workers)
+            atexit.register(executor.shutdown)
+        return executor
+
+
+def _open(url: str, method: str = "GET", headers: Optional[dict] = None, timeout: float = 30) -> HTTPResponse:
+    """Send a request over a pooled keep-alive connection.
+    
+    Follows redirects and retries transient failures with exponential backoff.
+    Proxies configured in the environment (``https_proxy`` etc.) are used.
+    Raises HTTPError for error statuses and URLError for connection failures,
+    like urlopen. The response must be read to completion before the calling
+    thread issues another request.
+    """
+    request_headers = {"User-Agent": USER_AGENT}
+    if headers:
+        request_headers.update(headers)
+    
+    attempt = 0
+    redirects = 0
+    while True:
+        parts = urlsplit(url)
+        conn, proxy_headers = _connection(parts.scheme, parts.netloc, timeout)
+        if proxy_headers is None:
+            target = parts.path or "/"
+            if parts.query:
+                target += "?" + parts.query
+            send_headers = request_headers
+        else:
+            target = urlunsplit(parts._replace(fragment=""))
+            send_headers = {**request_headers, **proxy_headers}
+        
+        try:
+            conn.request(method, target, headers=send_headers)
+            response = conn.getresponse()
+        except (OSError, HTTPException) as e:
+            # Stale keep-alive sockets surface here too; reconnect and retry
+            conn.close()
+            if attempt >= MAX_RETRIES:
+                raise URLError(e) from e
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+            attempt += 1
+            continue
+        
+        location = response.getheader("Location")
+        if response.status in REDIRECT_STATUSES and location and redirects < MAX_REDIRECTS:
+            response.read()
+            url = urljoin(url, location)
+            redirects += 1
+            continue
+        
+        if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+            response.read()
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+            attempt += 1
+            continue
+        
+        # Anything but a success or 304 left over here is a failure, including
+        # redirects without a Location and redirect loops
+        if response.status >= 300 and response.status != 304:
+            response.read()
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+        
+        return response
+
+
+def _read_body(response: HTTPResponse) -> bytes:
+    """Read a response body, undoing gzip content encoding."""
+    body = response.read()
+    if body and response.getheader("Content-Encoding") == "gzip":
+        return gzip.decompress(body)
+    return body
+
+
+def _request(url: str, headers: Optional[dict] = None, timeout: float = 30) -> bytes:
+    """GET a URL over a pooled connection and return the response body."""
+    request_headers = {"Accept-Encoding": "gzip"}
+    if headers:
+        request_headers.update(headers)
+    return _read_body(_open(url, headers=request_headers, timeout=timeout))
+
+
+# On-disk HTTP cache, opened on first use and shared by all threads
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def _http_cache_db() -> sqlite3.Connection:
+    """Open the HTTP cache database if needed. Callers must hold the lock."""
+    global _http_cache
+    if _http_cache is None:
+        HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _http_cache = sqlite3.connect(HTTP_CACHE_PATH, check_same_thread=False)
+        _http_cache.execute("PRAGMA journal_mode=WAL")
+        _http_cache.execute("PRAGMA synchronous=NORMAL")
+        _http_cache.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB NOT NULL)"
+        )
+        atexit.register(_http_cache.close)
+    return _http_cache
+
+
+def _cached_request(url: str, timeout: float = 30) -> bytes:
+    """GET a URL, revalidating against the on-disk HTTP cache.
+    
+    Sends If-None-Match/If-Modified-Since for previously seen URLs so an
+    unchanged document comes back as a bodyless 304. Entries live in a single
+    SQLite database rather than one file per URL.
+    """
+    with _http_cache_lock:
+        cached = _http_cache_db().execute(
+            "SELECT etag, last_modified, body FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+    
+    headers = {"Accept-Encoding": "gzip"}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    
+    response = _open(url, headers=headers, timeout=timeout)
+    body = _read_body(response)
+    if response.status == 304 and cached:
+        return cached[2]
+    
+    etag = response.getheader("ETag")
+    last_modified = response.getheader("Last-Modified")
+    if etag or last_modified:
+        with _http_cache_lock:
+            db = _http_cache_db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                    (url, etag, last_modified, body),
+                )
+    return body
+
+
+def load_json(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def fetch_bytes(url: str, cached: bool = False) -> Optional[bytes]:
+    """Fetch the raw body of a URL with error handling.
+    
+    With ``cached``, the request is revalidated against the on-disk HTTP cache.
+    """
     try:
-        req = Request(url, headers={"User-Agent": "screencapturekit-rs-docs/1.0"})
-        with urlopen(req, timeout=30) as response:
-            return json.loads(response.read().decode("utf-8"))
+        return _cached_request(url) if cached else _request(url)
     except HTTPError as e:
         if e.code == 404:
             print(f"  ⚠️  Not found: {url}")
@@ -132,65 +399,130 @@ def fetch_json(url: str) -> Optional[dict]:
     except URLError as e:
         print(f"  ❌ URL Error: {e.reason}")
         return None
+    except (OSError, HTTPException, EOFError) as e:
+        # Failures while reading the body (truncated response, read timeout)
+        print(f"  ❌ Read failed: {url}: {e!r}")
+        return None
+
+
+def fetch_json(url: str, cached: bool = False) -> Optional[dict]:
+    """Fetch JSON from URL with error handling."""
+    body = fetch_bytes(url, cached=cached)
+    if body is None:
+        return None
+    try:
+        return load_json(body)
     except json.JSONDecodeError:
         print(f"  ❌ Invalid JSON: {url}")
         return None
 
 
-def fetch_text(url: str) -> Optional[str]:
-    """Fetch text content from URL."""
+def fetch_text(url: str, cached: bool = False) -> Optional[str]:
+    """Fetch text content from URL.
+    
+    With ``cached``, the request is revalidated against the on-disk HTTP cache.
+    """
     try:
-        req = Request(url, headers={"User-Agent": "screencapturekit-rs-docs/1.0"})
-        with urlopen(req, timeout=30) as response:
-            return response.read().decode("utf-8")
-    except (HTTPError, URLError) as e:
+        body = _cached_request(url) if cached else _request(url)
+        return body.decode("utf-8")
+    except (OSError, HTTPException, EOFError) as e:
         return None
 
 
-def download_file(url: str) -> Optional[bytes]:
-    """Download file from URL."""
+def fetch_validator(url: str) -> Optional[str]:
+    """Identify the current version of a URL via a HEAD request.
+    
+    Returns the ETag, falling back to Content-Length, or None if the request
+    fails or the server sends neither.
+    """
     try:
-        req = Request(url, headers={"User-Agent": "screencapturekit-rs-docs/1.0"})
-        with urlopen(req, timeout=60) as response:
-            return response.read()
-    except (HTTPError, URLError) as e:
-        print(f"  ❌ Download failed: {e}")
+        response = _open(url, method="HEAD")
+        response.read()
+        return response.getheader("ETag") or response.getheader("Content-Length")
+    except (OSError, HTTPException):
         return None
 
 
-def extract_text_from_content(content: list) -> str:
-    """Recursively extract text from Apple's content structure."""
-    result = []
+def download_file(url: str, dest) -> bool:
+    """Stream a URL's body into an open binary file without buffering it in memory."""
+    try:
+        response = _open(url, timeout=120)
+        shutil.copyfileobj(response, dest, COPY_CHUNK_SIZE)
+        return True
+    except (OSError, HTTPException) as e:
+        print(f"  ❌ Download failed: {e}")
+        return False
+
+
+def _text_node(item: dict, out: list) -> None:
+    """Append a plain text run."""
+    out.append(item.get("text", ""))
+
+
+def _code_voice_node(item: dict, out: list) -> None:
+    """Append inline code as a backtick span."""
+    out.append(f"`{item.get('code', '')}`")
+
+
+def _reference_node(item: dict, out: list) -> None:
+    """Append a symbol reference as its backticked name."""
+    # Extract just the symbol name from reference
+    identifier = item.get("identifier", "")
+    name = identifier.split("/")[-1] if "/" in identifier else identifier
+    out.append(f"`{name}`")
+
+
+def _emphasis_node(item: dict, out: list) -> None:
+    """Append emphasized content wrapped in ``*``."""
+    out.append("*")
+    _extract_text(item.get("inlineContent", []), out)
+    out.append("*")
+
+
+def _strong_node(item: dict, out: list) -> None:
+    """Append strong content wrapped in ``**``."""
+    out.append("**")
+    _extract_text(item.get("inlineContent", []), out)
+    out.append("**")
+
+
+def _link_node(item: dict, out: list) -> None:
+    """Append a link as a markdown ``[text](destination)``."""
+    out.append("[")
+    _extract_text(item.get("inlineContent", []), out)
+    out.append(f"]({item.get('destination', '')})")
+
+
+# Inline node type -> handler appending its text to an output list
+_INLINE_HANDLERS = {
+    "text": _text_node,
+    "codeVoice": _code_voice_node,
+    "reference": _reference_node,
+    "emphasis": _emphasis_node,
+    "strong": _strong_node,
+    "link": _link_node,
+}
+
+
+def _extract_text(content: list, out: list) -> None:
+    """Append the text of Apple's content structure to ``out``, recursively."""
     for item in content:
         if isinstance(item, str):
-            result.append(item)
+            out.append(item)
         elif isinstance(item, dict):
-            item_type = item.get("type", "")
-            
-            if item_type == "text":
-                result.append(item.get("text", ""))
-            elif item_type == "codeVoice":
-                result.append(f"`{item.get('code', '')}`")
-            elif item_type == "reference":
-                # Extract just the symbol name from reference
-                identifier = item.get("identifier", "")
-                name = identifier.split("/")[-1] if "/" in identifier else identifier
-                result.append(f"`{name}`")
-            elif item_type == "emphasis":
-                inner = extract_text_from_content(item.get("inlineContent", []))
-                result.append(f"*{inner}*")
-            elif item_type == "strong":
-                inner = extract_text_from_content(item.get("inlineContent", []))
-                result.append(f"**{inner}**")
-            elif item_type == "link":
-                inner = extract_text_from_content(item.get("inlineContent", []))
-                url = item.get("destination", "")
-                result.append(f"[{inner}]({url})")
+            handler = _INLINE_HANDLERS.get(item.get("type", ""))
+            if handler is not None:
+                handler(item, out)
             elif "inlineContent" in item:
-                result.append(extract_text_from_content(item["inlineContent"]))
+                _extract_text(item["inlineContent"], out)
             elif "content" in item:
-                result.append(extract_text_from_content(item["content"]))
-    
+                _extract_text(item["content"], out)
+
+
+def extract_text_from_content(content: list) -> str:
+    """Recursively extract text from Apple's content structure."""
+    result = []
+    _extract_text(content, result)
     return "".join(result)
 
 
@@ -210,16 +542,50 @@ def identifier_to_path(identifier: str) -> Optional[str]:
     return path.lower()
 
 
-def fetch_child_doc(identifier: str) -> Optional[dict]:
-    """Fetch documentation for a child symbol."""
+# Successfully fetched child docs, keyed by identifier. Failures are not
+# stored so a transient error doesn't stick for the rest of the run.
+_child_docs = {}
+
+
+def fetch_child_doc(identifier: str) -> Optional[Mapping]:
+    """Fetch documentation for a child symbol.
+    
+    Results are memoized for the whole run because convert_to_markdown and
+    generate_api_complete expand overlapping symbols. The returned mapping is
+    shared between callers and therefore read-only.
+    """
+    doc = _child_docs.get(identifier)
+    if doc is not None:
+        return doc
+    
     path = identifier_to_path(identifier)
     if not path:
         return None
     url = f"{DOCS_JSON_BASE}/{path}.json"
-    return fetch_json(url)
+    data = fetch_json(url, cached=True)
+    if data is None:
+        return None
+    doc = _child_docs[identifier] = MappingProxyType(data)
+    return doc
 
 
-def format_child_doc(data: dict) -> str:
+def child_identifiers(data: dict) -> list:
+    """List the ScreenCaptureKit child symbols referenced from a doc's topics."""
+    return [
+        identifier
+        for topic in data.get("topicSections", [])
+        for identifier in topic.get("identifiers", [])
+        if identifier.startswith("doc://com.apple.screencapturekit")
+    ]
+
+
+def prefetch_child_docs(identifiers: list, max_workers: int = DOWNLOAD_WORKERS) -> dict:
+    """Fetch child docs concurrently, returning a dict keyed by identifier."""
+    unique = list(dict.fromkeys(identifiers))
+    return dict(zip(unique, _executor(max_workers).map(fetch_child_doc, unique)))
+
+
+def format_child_doc(data: Mapping) -> str:
     """Format a child document (property/method) as markdown section."""
     if not data:
         return ""
@@ -258,24 +624,27 @@ def format_child_doc(data: dict) -> str:
     return "\n".join(lines)
 
 
-def json_to_markdown(data: dict, path: str, include_children: bool = False) -> str:
-    """Convert Apple documentation JSON to markdown."""
-    md_lines = []
+def json_to_markdown(data: dict, path: str, child_cache: Optional[dict] = None) -> str:
+    """Convert Apple documentation JSON to markdown.
+    
+    If ``child_cache`` is given (see ``prefetch_child_docs``), each topic entry
+    is expanded with its child symbol's declaration and description.
+    """
+    buf = io.StringIO()
     
     # Get metadata
     metadata = data.get("metadata", {})
     title = metadata.get("title", path.split("/")[-1])
     role = metadata.get("role", "")
     platforms = metadata.get("platforms", [])
+    refs = data.get("references", {})
     
     # Header
-    md_lines.append(f"# {title}")
-    md_lines.append("")
+    buf.write(f"# {title}\n\n")
     
     # Role/type badge
     if role:
-        md_lines.append(f"**Type:** {role}")
-        md_lines.append("")
+        buf.write(f"**Type:** {role}\n\n")
     
     # Platform availability
     if platforms:
@@ -286,8 +655,7 @@ def json_to_markdown(data: dict, path: str, include_children: bool = False) -> s
             if name and intro:
                 avail.append(f"{name} {intro}+")
         if avail:
-            md_lines.append(f"**Availability:** {', '.join(avail)}")
-            md_lines.append("")
+            buf.write(f"**Availability:** {', '.join(avail)}\n\n")
     
     # Abstract/overview from primaryContentSections
     primary = data.get("primaryContentSections", [])
@@ -295,15 +663,11 @@ def json_to_markdown(data: dict, path: str, include_children: bool = False) -> s
         kind = section.get("kind", "")
         
         if kind == "declarations":
-            md_lines.append("## Declaration")
-            md_lines.append("")
+            buf.write("## Declaration\n\n")
             for decl in section.get("declarations", []):
                 code = format_declaration(decl)
                 lang = decl.get("languages", ["swift"])[0]
-                md_lines.append(f"```{lang}")
-                md_lines.append(code)
-                md_lines.append("```")
-                md_lines.append("")
+                buf.write(f"```{lang}\n{code}\n```\n\n")
         
         elif kind == "content":
             for content_item in section.get("content", []):
@@ -312,21 +676,16 @@ def json_to_markdown(data: dict, path: str, include_children: bool = False) -> s
                 if content_type == "heading":
                     level = content_item.get("level", 2)
                     text = extract_text_from_content(content_item.get("inlineContent", []))
-                    md_lines.append(f"{'#' * level} {text}")
-                    md_lines.append("")
+                    buf.write(f"{'#' * level} {text}\n\n")
                 
                 elif content_type == "paragraph":
                     text = extract_text_from_content(content_item.get("inlineContent", []))
-                    md_lines.append(text)
-                    md_lines.append("")
+                    buf.write(f"{text}\n\n")
                 
                 elif content_type == "codeListing":
                     lang = content_item.get("syntax", "swift")
                     code = "\n".join(content_item.get("code", []))
-                    md_lines.append(f"```{lang}")
-                    md_lines.append(code)
-                    md_lines.append("```")
-                    md_lines.append("")
+                    buf.write(f"```{lang}\n{code}\n```\n\n")
                 
                 elif content_type == "unorderedList":
                     for list_item in content_item.get("items", []):
@@ -334,12 +693,11 @@ def json_to_markdown(data: dict, path: str, include_children: bool = False) -> s
                         for ic in item_content:
                             if ic.get("type") == "paragraph":
                                 text = extract_text_from_content(ic.get("inlineContent", []))
-                                md_lines.append(f"- {text}")
-                    md_lines.append("")
+                                buf.write(f"- {text}\n")
+                    buf.write("\n")
         
         elif kind == "parameters":
-            md_lines.append("## Parameters")
-            md_lines.append("")
+            buf.write("## Parameters\n\n")
             for param in section.get("parameters", []):
                 name = param.get("name", "")
                 content = param.get("content", [])
@@ -348,23 +706,20 @@ def json_to_markdown(data: dict, path: str, include_children: bool = False) -> s
                     if c.get("type") == "paragraph":
                         desc = extract_text_from_content(c.get("inlineContent", []))
                         break
-                md_lines.append(f"- **{name}**: {desc}")
-            md_lines.append("")
+                buf.write(f"- **{name}**: {desc}\n")
+            buf.write("\n")
     
     # Topic sections (methods, properties, etc.)
     topics = data.get("topicSections", [])
     if topics:
-        md_lines.append("## Topics")
-        md_lines.append("")
+        buf.write("## Topics\n\n")
         
         for topic in topics:
             topic_title = topic.get("title", "")
-            md_lines.append(f"### {topic_title}")
-            md_lines.append("")
+            buf.write(f"### {topic_title}\n\n")
             
             for identifier in topic.get("identifiers", []):
                 # Get reference info if available
-                refs = data.get("references", {})
                 ref = refs.get(identifier, {})
                 ref_title = ref.get("title", identifier.split("/")[-1])
                 ref_abstract = ref.get("abstract", [])
@@ -373,38 +728,32 @@ def json_to_markdown(data: dict, path: str, include_children: bool = False) -> s
                 if ref_abstract:
                     abstract_text = extract_text_from_content(ref_abstract)
                 
-                md_lines.append(f"#### {ref_title}")
-                md_lines.append("")
+                buf.write(f"#### {ref_title}\n\n")
                 if abstract_text:
-                    md_lines.append(abstract_text)
-                    md_lines.append("")
+                    buf.write(f"{abstract_text}\n\n")
                 
-                # Fetch and include child documentation if enabled
-                if include_children and identifier.startswith("doc://com.apple.screencapturekit"):
-                    child_data = fetch_child_doc(identifier)
+                # Include prefetched child documentation if enabled
+                if child_cache is not None:
+                    child_data = child_cache.get(identifier)
                     if child_data:
                         child_content = format_child_doc(child_data)
                         if child_content:
-                            md_lines.append(child_content)
-                            md_lines.append("")
-                    time.sleep(0.1)  # Rate limit
+                            buf.write(f"{child_content}\n\n")
             
-            md_lines.append("")
+            buf.write("\n")
     
     # See also
     see_also = data.get("seeAlsoSections", [])
     if see_also:
-        md_lines.append("## See Also")
-        md_lines.append("")
+        buf.write("## See Also\n\n")
         for section in see_also:
             for identifier in section.get("identifiers", []):
-                refs = data.get("references", {})
                 ref = refs.get(identifier, {})
                 ref_title = ref.get("title", identifier.split("/")[-1])
-                md_lines.append(f"- {ref_title}")
-        md_lines.append("")
+                buf.write(f"- {ref_title}\n")
+        buf.write("\n")
     
-    return "\n".join(md_lines)
+    return buf.getvalue()
 
 
 def download_docs():
@@ -414,21 +763,17 @@ def download_docs():
     
     JSON_DIR.mkdir(parents=True, exist_ok=True)
     
+    def fetch_doc(doc_path: str) -> Optional[bytes]:
+        return fetch_bytes(f"{DOCS_JSON_BASE}/{doc_path}.json", cached=True)
+    
+    # Fetch concurrently; the worker count keeps us polite to Apple's servers.
+    # Bodies are saved as served: convert_to_markdown parses them anyway.
     downloaded = 0
-    for doc_path in DOC_PATHS:
-        url = f"{DOCS_JSON_BASE}/{doc_path}.json"
-        filename = doc_path.replace("/", "_") + ".json"
-        output_path = JSON_DIR / filename
-        
-        print(f"  📄 {doc_path}...")
-        data = fetch_json(url)
-        
-        if data:
-            with open(output_path, "w") as f:
-                json.dump(data, f, indent=2)
+    for doc_path, body in zip(DOC_PATHS, _executor().map(fetch_doc, DOC_PATHS)):
+        if body:
+            filename = doc_path.replace("/", "_") + ".json"
+            (JSON_DIR / filename).write_bytes(body)
             downloaded += 1
-        
-        time.sleep(0.2)  # Be nice to Apple's servers
     
     print(f"✅ Downloaded {downloaded}/{len(DOC_PATHS)} documentation files")
     return downloaded
@@ -444,22 +789,17 @@ def convert_to_markdown(include_children: bool = True):
     converted = 0
     for json_file in JSON_DIR.glob("*.json"):
         try:
-            with open(json_file) as f:
-                data = json.load(f)
+            data = load_json(json_file.read_bytes())
             
             # Only expand children for main class docs (not sub-properties)
             should_expand = include_children and "_" not in json_file.stem.replace("screencapturekit_", "")
+            child_cache = prefetch_child_docs(child_identifiers(data)) if should_expand else None
+            md_content = json_to_markdown(data, json_file.stem, child_cache=child_cache)
+            md_path = MARKDOWN_DIR / (json_file.stem + ".md")
             
-            print(f"  📄 {json_file.stem}..." + (" (expanding children)" if should_expand else ""))
-            md_content = json_to_markdown(data, json_file.stem, include_children=should_expand)
-            md_filename = json_file.stem + ".md"
-            md_path = MARKDOWN_DIR / md_filename
-            
-            with open(md_path, "w") as f:
-                f.write(md_content)
+            md_path.write_bytes(md_content.encode("utf-8"))
             
             converted += 1
-            print(f"  ✅ {md_filename}")
         except Exception as e:
             print(f"  ❌ {json_file.name}: {e}")
     
@@ -474,6 +814,10 @@ def download_samples():
     
     SAMPLES_DIR.mkdir(parents=True, exist_ok=True)
     
+    # Validators of the archives extracted by previous runs
+    etags_path = SAMPLES_DIR / ".etags.json"
+    etags = load_json(etags_path.read_bytes()) if etags_path.exists() else {}
+    
     downloaded = 0
     for sample in SAMPLE_PROJECTS:
         name = sample["name"]
@@ -482,40 +826,61 @@ def download_samples():
         
         print(f"  📥 {name}...")
         
-        data = download_file(url)
-        if not data:
+        # Skip the download if the archive hasn't changed since it was extracted
+        etag = fetch_validator(url)
+        if etag and etags.get(name) == etag and output_dir.exists():
+            downloaded += 1
+            print(f"  ✅ Unchanged, keeping {output_dir}")
             continue
         
-        # Extract zip
-        try:
-            with zipfile.ZipFile(BytesIO(data)) as zf:
-                # Extract only Swift/Objective-C source files
-                for info in zf.infolist():
-                    # Skip __MACOSX and hidden files
-                    if "__MACOSX" in info.filename or "/." in info.filename:
-                        continue
-                    
-                    # Only extract source code and relevant files
-                    ext = Path(info.filename).suffix.lower()
-                    if ext in [".swift", ".h", ".m", ".mm", ".metal", ".md", ".txt", ".plist"]:
-                        # Flatten directory structure a bit
-                        parts = Path(info.filename).parts
-                        if len(parts) > 1:
-                            # Remove top-level directory from zip
-                            rel_path = Path(*parts[1:])
-                        else:
-                            rel_path = Path(info.filename)
-                        
-                        out_path = output_dir / rel_path
-                        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryFile(suffix=".zip") as archive:
+            if not download_file(url, archive):
+                continue
+            
+            # Extract zip
+            try:
+                with zipfile.ZipFile(archive) as zf:
+                    # Extract only Swift/Objective-C source files. Archives can hold
+                    # thousands of entries, so paths are plain strings in this loop.
+                    output_prefix = str(output_dir)
+                    entries = []
+                    for info in zf.infolist():
+                        # Skip __MACOSX and hidden files
+                        if "__MACOSX" in info.filename or "/." in info.filename:
+                            continue
                         
+                        # Only extract source code and relevant files
+                        dot = info.filename.rfind(".")
+                        if dot >= 0 and info.filename[dot:].lower() in SAMPLE_FILE_EXTENSIONS:
+                            # Flatten directory structure a bit: remove top-level directory from zip
+                            _, sep, rel_path = info.filename.partition("/")
+                            if not sep:
+                                rel_path = info.filename
+                            
+                            # Keep entries inside output_dir: drop leading separators
+                            # and skip anything that normalises to a parent path
+                            rel_path = os.path.normpath(rel_path.lstrip("/"))
+                            if rel_path == ".." or rel_path.startswith("../"):
+                                continue
+                            
+                            entries.append((info, os.path.join(output_prefix, rel_path)))
+                    
+                    # Create each output directory once, before writing any files
+                    for directory in {os.path.dirname(out_path) for _, out_path in entries}:
+                        os.makedirs(directory, exist_ok=True)
+                    
+                    for info, out_path in entries:
                         with zf.open(info) as src, open(out_path, "wb") as dst:
-                            dst.write(src.read())
-            
-            downloaded += 1
-            print(f"  ✅ Extracted to {output_dir}")
-        except zipfile.BadZipFile:
-            print(f"  ❌ Invalid zip file: {name}")
+                            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+                
+                downloaded += 1
+                print(f"  ✅ Extracted to {output_dir}")
+                if etag:
+                    etags[name] = etag
+            except zipfile.BadZipFile:
+                print(f"  ❌ Invalid zip file: {name}")
+    
+    etags_path.write_bytes(dump_json(etags))
     
     print(f"✅ Downloaded {downloaded}/{len(SAMPLE_PROJECTS)} sample projects")
     return downloaded
@@ -527,120 +892,157 @@ def create_index():
     
     index_path = DOCS_DIR / "README.md"
     
-    lines = [
-        "# Apple ScreenCaptureKit Documentation",
-        "",
-        "Downloaded from Apple Developer Documentation for reference.",
-        "",
-        "**Note:** This documentation is © Apple Inc. and is included here for development reference only.",
-        "",
-        "## WWDC Sessions",
-        "",
-    ]
+    buf = io.StringIO()
+    buf.write(
+        "# Apple ScreenCaptureKit Documentation\n"
+        "\n"
+        "Downloaded from Apple Developer Documentation for reference.\n"
+        "\n"
+        "**Note:** This documentation is © Apple Inc. and is included here for development reference only.\n"
+        "\n"
+        "## WWDC Sessions\n"
+        "\n"
+    )
     
     # List WWDC sessions
     if WWDC_DIR.exists():
         wwdc_files = sorted(WWDC_DIR.glob("*.md"))
         for wwdc_file in wwdc_files:
-            lines.append(f"- [{wwdc_file.stem}](wwdc/{wwdc_file.name})")
+            buf.write(f"- [{wwdc_file.stem}](wwdc/{wwdc_file.name})\n")
     
-    lines.extend([
-        "",
-        "## API Documentation",
-        "",
-    ])
+    buf.write(
+        "\n"
+        "## API Documentation\n"
+        "\n"
+    )
     
     # List markdown files
     if MARKDOWN_DIR.exists():
         md_files = sorted(MARKDOWN_DIR.glob("*.md"))
         for md_file in md_files:
             name = md_file.stem.replace("screencapturekit_", "")
-            lines.append(f"- [{name}](markdown/{md_file.name})")
+            buf.write(f"- [{name}](markdown/{md_file.name})\n")
     
-    lines.extend([
-        "",
-        "## Sample Projects",
-        "",
-    ])
+    buf.write(
+        "\n"
+        "## Sample Projects\n"
+        "\n"
+    )
     
     # List sample projects
     if SAMPLES_DIR.exists():
         for sample_dir in sorted(SAMPLES_DIR.iterdir()):
             if sample_dir.is_dir():
-                lines.append(f"- [{sample_dir.name}](samples/{sample_dir.name}/)")
-    
-    lines.extend([
-        "",
-        "## Quick Reference",
-        "",
-        "- [**API-COMPLETE.md**](API-COMPLETE.md) - All function signatures in one file",
-        "",
-        "## Raw JSON",
-        "",
-        f"Raw JSON documentation files are in [json/](json/).",
-        "",
-        "---",
-        "",
-        f"Generated by `scripts/download_apple_docs.py`",
-    ])
-    
-    with open(index_path, "w") as f:
-        f.write("\n".join(lines))
+                buf.write(f"- [{sample_dir.name}](samples/{sample_dir.name}/)\n")
+    
+    buf.write(
+        "\n"
+        "## Quick Reference\n"
+        "\n"
+        "- [**API-COMPLETE.md**](API-COMPLETE.md) - All function signatures in one file\n"
+        "\n"
+        "## Raw JSON\n"
+        "\n"
+        "Raw JSON documentation files are in [json/](json/).\n"
+        "\n"
+        "---\n"
+        "\n"
+        "Generated by `scripts/download_apple_docs.py`\n"
+    )
+    
+    index_path.write_bytes(buf.getvalue().encode("utf-8"))
     
     print(f"✅ Created {index_path}")
 
 
 def extract_transcript_from_html(html_content: str) -> Optional[str]:
-    """Extract transcript text from Apple WWDC video page HTML."""
-    # Find transcript section
-    match = re.search(r'<section id="transcript-content">(.*?)</section>', html_content, re.DOTALL)
-    if not match:
-        return None
+    """Extract transcript text from Apple WWDC video page HTML.
     
-    transcript_html = match.group(1)
+    Uses selectolax's lexbor HTML parser when it is installed, otherwise plain
+    substring search and a tag-stripping regex.
+    """
+    if HTMLParser is not None:
+        node = HTMLParser(html_content).css_first("section#transcript-content")
+        if node is None:
+            return None
+        # Entities are decoded by the parser
+        text = node.text(separator=" ")
+    else:
+        # Find transcript section
+        start = html_content.find(TRANSCRIPT_START_TAG)
+        if start < 0:
+            return None
+        start += len(TRANSCRIPT_START_TAG)
+        end = html_content.find("</section>", start)
+        if end < 0:
+            return None
+        
+        transcript_html = html_content[start:end]
+        
+        # Remove HTML tags
+        text = HTML_TAG_RE.sub(' ', transcript_html)
+        # Decode HTML entities
+        text = html.unescape(text)
     
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', ' ', transcript_html)
-    # Decode HTML entities
-    text = html.unescape(text)
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE_RE.sub(' ', text).strip()
     
     return text
 
 
 def format_transcript_as_markdown(transcript: str, title: str, year: str, session_id: str) -> str:
     """Format transcript text as markdown with proper paragraphs."""
-    lines = [
-        f"# {title}",
-        "",
-        f"**WWDC{year}** | Session {session_id}",
-        "",
-        f"📺 [Watch Video](https://developer.apple.com/videos/play/wwdc{year}/{session_id}/)",
-        "",
-        "---",
-        "",
-        "## Transcript",
-        "",
-    ]
+    buf = io.StringIO()
+    buf.write(
+        f"# {title}\n"
+        "\n"
+        f"**WWDC{year}** | Session {session_id}\n"
+        "\n"
+        f"📺 [Watch Video](https://developer.apple.com/videos/play/wwdc{year}/{session_id}/)\n"
+        "\n"
+        "---\n"
+        "\n"
+        "## Transcript\n"
+        "\n"
+    )
     
     # Split into sentences and create paragraphs
-    sentences = re.split(r'(?<=[.!?])\s+', transcript)
+    sentences = SENTENCE_SPLIT_RE.split(transcript)
     
     paragraph = []
     for sentence in sentences:
         paragraph.append(sentence)
         # Create new paragraph every 3-4 sentences or at topic changes
         if len(paragraph) >= 4 or any(kw in sentence.lower() for kw in ['let me show', "let's", 'next', 'now', 'first', 'finally', 'to recap']):
-            lines.append(' '.join(paragraph))
-            lines.append("")
+            buf.write(f"{' '.join(paragraph)}\n\n")
             paragraph = []
     
     if paragraph:
-        lines.append(' '.join(paragraph))
-        lines.append("")
+        buf.write(f"{' '.join(paragraph)}\n\n")
+    
+    return buf.getvalue()
+
+
+def fetch_wwdc_session(session: dict) -> tuple:
+    """Fetch a WWDC session's community notes and transcript.
+    
+    Returns ``(notes, transcript)``; either is None if unavailable.
+    """
+    year = session["year"]
+    session_id = session["id"]
+    
+    # Try to get WWDCNotes community notes first
+    notes_url = f"{WWDC_NOTES_BASE}/WWDC{year}/WWDC{year}-{session_id}-{session['slug']}.md"
+    notes_content = fetch_text(notes_url, cached=True)
+    
+    # Get transcript from Apple
+    apple_url = f"https://developer.apple.com/videos/play/wwdc{year}/{session_id}/"
+    apple_html = fetch_text(apple_url, cached=True)
+    transcript = None
+    if apple_html:
+        transcript = extract_transcript_from_html(apple_html)
     
-    return '\n'.join(lines)
+    return notes_content, transcript
 
 
 def download_wwdc_sessions():
@@ -650,78 +1052,67 @@ def download_wwdc_sessions():
     
     WWDC_DIR.mkdir(parents=True, exist_ok=True)
     
+    # Fetch all sessions concurrently, then write them in order
+    fetched = list(_executor().map(fetch_wwdc_session, WWDC_SESSIONS))
+    
     downloaded = 0
-    for session in WWDC_SESSIONS:
+    for session, (notes_content, transcript) in zip(WWDC_SESSIONS, fetched):
         year = session["year"]
         session_id = session["id"]
         title = session["title"]
-        slug = session["slug"]
-        
-        print(f"  📺 WWDC{year}-{session_id}: {title}...")
-        
-        # Try to get WWDCNotes community notes first
-        notes_url = f"{WWDC_NOTES_BASE}/WWDC{year}/WWDC{year}-{session_id}-{slug}.md"
-        notes_content = fetch_text(notes_url)
-        
-        # Get transcript from Apple
-        apple_url = f"https://developer.apple.com/videos/play/wwdc{year}/{session_id}/"
-        apple_html = fetch_text(apple_url)
-        transcript = None
-        if apple_html:
-            transcript = extract_transcript_from_html(apple_html)
         
         # Create combined markdown file
         output_file = WWDC_DIR / f"WWDC{year}-{session_id}-{title.replace(' ', '-').replace("'", '')}.md"
         
-        md_lines = [
-            f"# {title}",
-            "",
-            f"**WWDC{year}** | Session {session_id}",
-            "",
-            f"📺 [Watch Video](https://developer.apple.com/videos/play/wwdc{year}/{session_id}/)",
-            "",
-        ]
+        buf = io.StringIO()
+        buf.write(
+            f"# {title}\n"
+            "\n"
+            f"**WWDC{year}** | Session {session_id}\n"
+            "\n"
+            f"📺 [Watch Video](https://developer.apple.com/videos/play/wwdc{year}/{session_id}/)\n"
+            "\n"
+        )
         
         # Add WWDCNotes content if available (has code snippets)
         if notes_content and "No Overview Available" not in notes_content:
             # Extract just the content part (skip metadata)
-            content_match = re.search(r'\n## .+', notes_content, re.DOTALL)
+            content_match = NOTES_CONTENT_RE.search(notes_content)
             if content_match:
-                md_lines.append("---")
-                md_lines.append("")
-                md_lines.append("## Notes & Code Snippets")
-                md_lines.append("")
-                md_lines.append("*From [WWDCNotes](https://wwdcnotes.com) community*")
-                md_lines.append("")
-                md_lines.append(content_match.group(0).strip())
-                md_lines.append("")
+                buf.write(
+                    "---\n"
+                    "\n"
+                    "## Notes & Code Snippets\n"
+                    "\n"
+                    "*From [WWDCNotes](https://wwdcnotes.com) community*\n"
+                    "\n"
+                    f"{content_match.group(0).strip()}\n"
+                    "\n"
+                )
         
         # Add transcript if available
         if transcript:
-            md_lines.append("---")
-            md_lines.append("")
-            md_lines.append("## Full Transcript")
-            md_lines.append("")
+            buf.write(
+                "---\n"
+                "\n"
+                "## Full Transcript\n"
+                "\n"
+            )
             
             # Split into paragraphs
-            sentences = re.split(r'(?<=[.!?])\s+', transcript)
+            sentences = SENTENCE_SPLIT_RE.split(transcript)
             paragraph = []
             for sentence in sentences:
                 paragraph.append(sentence)
                 if len(paragraph) >= 4:
-                    md_lines.append(' '.join(paragraph))
-                    md_lines.append("")
+                    buf.write(f"{' '.join(paragraph)}\n\n")
                     paragraph = []
             if paragraph:
-                md_lines.append(' '.join(paragraph))
-                md_lines.append("")
+                buf.write(f"{' '.join(paragraph)}\n\n")
         
-        with open(output_file, "w") as f:
-            f.write('\n'.join(md_lines))
+        output_file.write_bytes(buf.getvalue().encode("utf-8"))
         
         downloaded += 1
-        print(f"    ✅ Saved {output_file.name}")
-        time.sleep(0.3)
     
     print(f"✅ Downloaded {downloaded}/{len(WWDC_SESSIONS)} WWDC sessions")
     return downloaded
@@ -750,140 +1141,141 @@ def extract_declarations_from_json(data: dict) -> list:
     return declarations
 
 
+def is_class_doc(data: dict) -> bool:
+    """Whether a doc describes a type (as opposed to e.g. the framework overview)."""
+    return data.get("metadata", {}).get("role", "") in ["symbol", "collectionGroup"]
+
+
+def collect_class_api(data: dict, child_cache: dict) -> Optional[dict]:
+    """Collect the class and member declarations from one class doc.
+    
+    Child docs are looked up in ``child_cache`` (see ``prefetch_child_docs``),
+    so this does no I/O. Returns ``{"declaration": ..., "members": [...]}``, or
+    None if the doc has no declarations at all.
+    """
+    # Get class-level declaration
+    class_decl = None
+    primary = data.get("primaryContentSections", [])
+    for section in primary:
+        if section.get("kind") == "declarations":
+            for decl in section.get("declarations", []):
+                class_decl = format_declaration(decl)
+                break
+    
+    # Collect all member declarations
+    members = []
+    topics = data.get("topicSections", [])
+    
+    for topic in topics:
+        # Interned: the same few titles key the topic grouping of every class
+        topic_title = sys.intern(topic.get("title", ""))
+        
+        for identifier in topic.get("identifiers", []):
+            child_data = child_cache.get(identifier)
+            if not child_data:
+                continue
+            
+            child_meta = child_data.get("metadata", {})
+            child_title = child_meta.get("title", "")
+            child_role = child_meta.get("symbolKind", child_meta.get("role", ""))
+            
+            # Get declaration
+            child_primary = child_data.get("primaryContentSections", [])
+            for section in child_primary:
+                if section.get("kind") == "declarations":
+                    for decl in section.get("declarations", []):
+                        code = format_declaration(decl)
+                        if code:
+                            members.append({
+                                "name": child_title,
+                                "declaration": code,
+                                "kind": child_role,
+                                "topic": topic_title
+                            })
+                        break
+    
+    if class_decl or members:
+        return {
+            "declaration": class_decl,
+            "members": members
+        }
+    return None
+
+
 def generate_api_complete():
     """Generate a single API-COMPLETE.md with all function signatures grouped by type."""
     print("\n📋 Generating API-COMPLETE.md...")
     
     output_path = DOCS_DIR / "API-COMPLETE.md"
     
-    # Collect all APIs by class
-    api_by_class = {}
-    
+    # Load every class doc up front so all child docs are fetched in one sweep
+    class_docs = []
     for json_file in sorted(JSON_DIR.glob("*.json")):
         try:
-            with open(json_file) as f:
-                data = json.load(f)
-            
-            metadata = data.get("metadata", {})
-            title = metadata.get("title", json_file.stem)
-            role = metadata.get("role", "")
-            
+            data = load_json(json_file.read_bytes())
             # Skip non-class files (like the framework overview)
-            if role not in ["symbol", "collectionGroup"]:
-                continue
-            
-            # Get class-level declaration
-            class_decl = None
-            primary = data.get("primaryContentSections", [])
-            for section in primary:
-                if section.get("kind") == "declarations":
-                    for decl in section.get("declarations", []):
-                        class_decl = format_declaration(decl)
-                        break
-            
-            # Collect all member declarations
-            members = []
-            topics = data.get("topicSections", [])
-            
-            for topic in topics:
-                topic_title = topic.get("title", "")
-                
-                for identifier in topic.get("identifiers", []):
-                    if not identifier.startswith("doc://com.apple.screencapturekit"):
-                        continue
-                    
-                    # Fetch child doc
-                    child_data = fetch_child_doc(identifier)
-                    if not child_data:
-                        continue
-                    
-                    child_meta = child_data.get("metadata", {})
-                    child_title = child_meta.get("title", "")
-                    child_role = child_meta.get("symbolKind", child_meta.get("role", ""))
-                    
-                    # Get declaration
-                    child_primary = child_data.get("primaryContentSections", [])
-                    for section in child_primary:
-                        if section.get("kind") == "declarations":
-                            for decl in section.get("declarations", []):
-                                code = format_declaration(decl)
-                                if code:
-                                    members.append({
-                                        "name": child_title,
-                                        "declaration": code,
-                                        "kind": child_role,
-                                        "topic": topic_title
-                                    })
-                                break
-                    
-                    time.sleep(0.05)  # Rate limit
-            
-            if class_decl or members:
-                api_by_class[title] = {
-                    "declaration": class_decl,
-                    "members": members
-                }
-        
+            if is_class_doc(data):
+                class_docs.append((json_file, data))
         except Exception as e:
             print(f"  ⚠️  Error processing {json_file.name}: {e}")
     
-    # Generate markdown
-    lines = [
-        "# ScreenCaptureKit API Reference",
-        "",
-        "Complete API signatures for all ScreenCaptureKit types.",
-        "",
-        "---",
-        "",
-    ]
+    identifiers = [identifier for _, data in class_docs for identifier in child_identifiers(data)]
+    child_cache = prefetch_child_docs(identifiers, max_workers=CHILD_SWEEP_WORKERS)
     
-    # Table of contents
-    lines.append("## Table of Contents")
-    lines.append("")
-    for class_name in sorted(api_by_class.keys()):
-        anchor = class_name.lower().replace(" ", "-")
-        lines.append(f"- [{class_name}](#{anchor})")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    
-    # Each class
-    for class_name in sorted(api_by_class.keys()):
-        info = api_by_class[class_name]
-        
-        lines.append(f"## {class_name}")
-        lines.append("")
-        
-        if info["declaration"]:
-            lines.append("```swift")
-            lines.append(info["declaration"])
-            lines.append("```")
-            lines.append("")
-        
-        # Group members by topic
-        members_by_topic = {}
-        for member in info["members"]:
-            topic = member.get("topic", "Other")
-            if topic not in members_by_topic:
-                members_by_topic[topic] = []
-            members_by_topic[topic].append(member)
+    # Collect all APIs by class
+    api_by_class = {}
+    for json_file, data in class_docs:
+        try:
+            info = collect_class_api(data, child_cache)
+            if info:
+                api_by_class[sys.intern(data["metadata"].get("title", json_file.stem))] = info
+        except Exception as e:
+            print(f"  ⚠️  Error processing {json_file.name}: {e}")
+    
+    # Generate markdown, streaming each class to the file as it is formatted
+    # and letting the file's buffer coalesce the many small writes
+    names = sorted(api_by_class)
+    toc = "".join([f"- [{name}](#{name.lower().replace(' ', '-')})\n" for name in names])
+    with open(output_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        # Header and table of contents
+        f.write(
+            "# ScreenCaptureKit API Reference\n"
+            "\n"
+            "Complete API signatures for all ScreenCaptureKit types.\n"
+            "\n"
+            "---\n"
+            "\n"
+            "## Table of Contents\n"
+            "\n"
+            f"{toc}"
+            "\n"
+            "---\n"
+            "\n"
+        )
         
-        for topic, members in members_by_topic.items():
-            if topic:
-                lines.append(f"### {topic}")
-                lines.append("")
+        # Each class
+        for class_name in names:
+            info = api_by_class[class_name]
+            declaration = info["declaration"]
             
-            lines.append("```swift")
-            for member in members:
-                lines.append(member["declaration"])
-            lines.append("```")
-            lines.append("")
-        
-        lines.append("---")
-        lines.append("")
-    
-    with open(output_path, "w") as f:
-        f.write("\n".join(lines))
+            f.write(f"## {class_name}\n\n")
+            
+            if declaration:
+                f.write(f"```swift\n{declaration}\n```\n\n")
+            
+            # Group members by topic
+            members_by_topic = defaultdict(list)
+            for member in info["members"]:
+                members_by_topic[member.get("topic", "Other")].append(member)
+            
+            for topic, members in members_by_topic.items():
+                if topic:
+                    f.write(f"### {topic}\n\n")
+                
+                body = "\n".join([member["declaration"] for member in members])
+                f.write(f"```swift\n{body}\n```\n\n")
+            
+            f.write("---\n\n")
     
     print(f"✅ Generated {output_path}")
     print(f"   {len(api_by_class)} classes documented")
@@ -891,27 +1283,26 @@ def generate_api_complete():
 
 def main():
     """Main entry point."""
-    print("=" * 60)
-    print("Apple ScreenCaptureKit Documentation Downloader")
-    print("=" * 60)
-    print()
+    sys.stdout.write(f"{'=' * 60}\nApple ScreenCaptureKit Documentation Downloader\n{'=' * 60}\n\n")
     
     # Create directories
     DOCS_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Download and process
-    download_docs()
-    convert_to_markdown()
-    download_samples()
-    download_wwdc_sessions()
+    # Download and process. Samples and WWDC sessions don't depend on the
+    # docs, so they download in the background; only the markdown conversion
+    # has to wait for download_docs.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        samples = executor.submit(download_samples)
+        wwdc = executor.submit(download_wwdc_sessions)
+        download_docs()
+        convert_to_markdown()
+        samples.result()
+        wwdc.result()
     generate_api_complete()
     create_index()
     
-    print()
-    print("=" * 60)
-    print("✅ Done!")
-    print(f"   Documentation: {DOCS_DIR}")
-    print("=" * 60)
+    sys.stdout.write(f"\n{'=' * 60}\n✅ Done!\n   Documentation: {DOCS_DIR}\n{'=' * 60}\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":